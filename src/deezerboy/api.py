@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import os
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Optional
 
+import numpy as np
 import pandas as pd
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 
 logger = logging.getLogger(__name__)
@@ -25,12 +31,22 @@ COLUMNS_FULL = COLUMNS_SHORT + [
 LASTFM_CACHE_PATH = Path.home() / ".cache" / "deezerboy" / "lastfm_cache.json"
 LASTFM_CACHE_TTL = 60 * 60 * 24 * 30
 _LASTFM_CACHE: dict[str, dict[str, Any]] | None = None
+_LASTFM_CACHE_LOCK = threading.Lock()
+
+MUSICBRAINZ_MIN_INTERVAL = 1.0
+_MUSICBRAINZ_LOCK = threading.Lock()
+_musicbrainz_last_call = 0.0
+
+MAX_WORKERS = 8
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
 
 
 def fetch_with_retry(url: str, max_retries: int = 2, delay: int = 5) -> dict:
     for attempt in range(max_retries):
         try:
-            data = requests.get(url, timeout=10).json()
+            data = _session.get(url, timeout=10).json()
             if "error" in data and data["error"].get("code") == 4:
                 logger.warning(f"Quota dépassé. Tentative {attempt + 1}/{max_retries} dans {delay}s...")
                 time.sleep(delay)
@@ -47,8 +63,7 @@ def get_playlist_ids(user_id: str, limit: int = 100) -> list[int]:
     playlists = fetch_with_retry(
         f"https://api.deezer.com/user/{user_id}/playlists?limit={limit}"
     )["data"]
-    names = [p["creator"]["name"] for p in playlists]
-    owner = max(names, key=names.count)
+    owner = Counter(p["creator"]["name"] for p in playlists).most_common(1)[0][0]
     ids = [p["id"] for p in playlists if p["creator"]["name"] == owner]
     logger.info(f"✅ {len(ids)} playlists trouvées")
     return ids
@@ -58,15 +73,19 @@ def _load_lastfm_cache() -> dict[str, dict[str, Any]]:
     global _LASTFM_CACHE
     if _LASTFM_CACHE is not None:
         return _LASTFM_CACHE
-    try:
-        _LASTFM_CACHE = (
-            json.loads(LASTFM_CACHE_PATH.read_text(encoding="utf-8"))
-            if LASTFM_CACHE_PATH.exists()
-            else {}
-        )
-    except Exception:
-        _LASTFM_CACHE = {}
-    return _LASTFM_CACHE
+    with _LASTFM_CACHE_LOCK:
+        # Another worker may have loaded it while we waited for the lock
+        if _LASTFM_CACHE is not None:
+            return _LASTFM_CACHE
+        try:
+            _LASTFM_CACHE = (
+                json.loads(LASTFM_CACHE_PATH.read_text(encoding="utf-8"))
+                if LASTFM_CACHE_PATH.exists()
+                else {}
+            )
+        except Exception:
+            _LASTFM_CACHE = {}
+        return _LASTFM_CACHE
 
 
 def _save_lastfm_cache(cache: dict) -> None:
@@ -91,7 +110,7 @@ def _lastfm_request(method: str, params: dict[str, Any]) -> Optional[dict[str, A
         return entry["data"]
 
     try:
-        resp = requests.get(
+        resp = _session.get(
             "https://ws.audioscrobbler.com/2.0/",
             params={**params, "method": method, "api_key": api_key, "format": "json"},
             timeout=8,
@@ -99,8 +118,9 @@ def _lastfm_request(method: str, params: dict[str, Any]) -> Optional[dict[str, A
         data = resp.json()
         if resp.status_code != 200 or "error" in data:
             return None
-        cache[cache_key] = {"timestamp": now, "data": data}
-        _save_lastfm_cache(cache)
+        with _LASTFM_CACHE_LOCK:
+            cache[cache_key] = {"timestamp": now, "data": data}
+            _save_lastfm_cache(cache)
         return data
     except Exception:
         return None
@@ -158,6 +178,17 @@ def get_lastfm_metadata(artist: str, title: str) -> dict[str, Any]:
     }
 
 
+def _musicbrainz_get(url: str, params: dict[str, Any]) -> requests.Response:
+    """MusicBrainz allows one request per second per client, across threads."""
+    global _musicbrainz_last_call
+    with _MUSICBRAINZ_LOCK:
+        wait = _musicbrainz_last_call + MUSICBRAINZ_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _musicbrainz_last_call = time.monotonic()
+    return _session.get(url, params=params, timeout=5)
+
+
 def _get_musicbrainz_enrichment(
     artist: str,
     title: str,
@@ -170,10 +201,9 @@ def _get_musicbrainz_enrichment(
         inc = "artist-credits+releases+tags"
 
         if isrc:
-            resp = requests.get(
+            resp = _musicbrainz_get(
                 f"https://musicbrainz.org/ws/2/isrc/{isrc}",
-                params={"fmt": "json", "inc": inc},
-                timeout=5,
+                {"fmt": "json", "inc": inc},
             )
             if resp.status_code == 200:
                 data = resp.json()
@@ -181,15 +211,14 @@ def _get_musicbrainz_enrichment(
                     recording = data["recordings"][0]
 
         if not recording:
-            resp = requests.get(
+            resp = _musicbrainz_get(
                 "https://musicbrainz.org/ws/2/recording/",
-                params={
+                {
                     "query": f'artist:"{artist}" AND recording:"{title}"',
                     "fmt": "json",
                     "limit": "1",
                     "inc": inc,
                 },
-                timeout=5,
             )
             if resp.status_code == 200:
                 data = resp.json()
@@ -217,13 +246,24 @@ def _get_musicbrainz_enrichment(
     return result
 
 
+@functools.lru_cache(maxsize=4096)
+def _fetch_album_info(album_id: int) -> tuple[tuple[str, ...], Optional[str]]:
+    """Genre names and release date of an album, shared by all of its tracks."""
+    data = fetch_with_retry(f"https://api.deezer.com/album/{album_id}")
+    genres = tuple(
+        g["name"]
+        for g in data.get("genres", {}).get("data", [])
+        if isinstance(g, dict) and g.get("name")
+    )
+    return genres, data.get("release_date") or data.get("date")
+
+
 def get_genres_deezer(track_data: dict) -> Optional[str]:
     try:
         album = track_data.get("album")
         if album and album.get("id"):
-            data = fetch_with_retry(f"https://api.deezer.com/album/{album['id']}")
-            genres = data.get("genres", {}).get("data", [])
-            return ", ".join(g["name"] for g in genres) or None
+            genres, _ = _fetch_album_info(album["id"])
+            return ", ".join(genres) or None
         return None
     except Exception as exc:
         logger.debug(f"Deezer genre erreur: {exc}")
@@ -235,9 +275,7 @@ def _get_album_release_date(deezer_track_data: dict) -> Optional[str]:
     try:
         album = deezer_track_data.get("album")
         if album and album.get("id"):
-            album_data = fetch_with_retry(f"https://api.deezer.com/album/{album['id']}")
-            # Try different date fields that Deezer might provide
-            release_date = album_data.get("release_date") or album_data.get("date")
+            _, release_date = _fetch_album_info(album["id"])
             if release_date:
                 # Deezer might return just year, or full date
                 return release_date
@@ -260,21 +298,12 @@ def _get_all_tags(artist_name: str, title: str, track_data: dict) -> Optional[st
     lastfm_tags.extend(_extract_tags(artist_data_lf, "artist"))
     all_tags.update(tag.strip() for tag in lastfm_tags if tag.strip())
 
-    # Get MusicBrainz tags from recording
-    mb_result = _get_musicbrainz_enrichment(artist_name, title, track_data.get("isrc"))
-    # Note: MusicBrainz tags are already processed in _get_musicbrainz_enrichment for genre,
-    # but we could extract them separately if needed for tags field
-
     # Get Deezer album tags (if available)
     try:
         album = track_data.get("album")
         if album and album.get("id"):
-            album_data = fetch_with_retry(f"https://api.deezer.com/album/{album['id']}")
-            # Deezer album might have genres/tags - checking available fields
-            genres = album_data.get("genres", {}).get("data", [])
-            for genre in genres:
-                if isinstance(genre, dict) and genre.get("name"):
-                    all_tags.add(genre["name"].strip())
+            genres, _ = _fetch_album_info(album["id"])
+            all_tags.update(genre.strip() for genre in genres)
     except Exception:
         pass  # Ignore errors in fetching album tags
 
@@ -316,7 +345,7 @@ def _get_track_enrichment(track_data: dict) -> dict[str, Any]:
     return result
 
 
-def get_new_row(track: dict, playlist_title: str, full_version: bool) -> Optional[dict]:
+def get_new_row(track: dict, full_version: bool) -> Optional[dict]:
     try:
         row = {
             "id": track.get("id"),
@@ -329,7 +358,6 @@ def get_new_row(track: dict, playlist_title: str, full_version: bool) -> Optiona
         }
         if full_version:
             row.update(_get_track_enrichment(track))
-        row[playlist_title] = True
         return row
     except Exception as exc:
         logger.error(f"❌ Erreur avec track {track.get('id')}: {exc}")
@@ -343,32 +371,66 @@ def fetch_tracks(
 ) -> pd.DataFrame:
     logger.info(f"Retrieving data for user {user_id}...")
 
-    df = pd.DataFrame(columns=COLUMNS_FULL if full_version else COLUMNS_SHORT)
     playlists = get_playlist_ids(user_id)
 
     if progress_callback:
         progress_callback("start", 0, len(playlists))
 
-    for idx, pid in enumerate(tqdm(playlists, desc="Fetching playlists")):
-        playlist = fetch_with_retry(f"https://api.deezer.com/playlist/{pid}?limit=2000")
-
-        if progress_callback:
-            progress_callback("progress", idx + 1, len(playlists), playlist["title"])
-
-        existing_ids = set(df["id"])
-        new_rows = []
-
-        for track in playlist.get("tracks", {}).get("data", []):
-            if track["id"] in existing_ids:
-                df.loc[df["id"] == track["id"], playlist["title"]] = True
-            else:
-                row = get_new_row(track, playlist["title"], full_version)
-                if row:
-                    new_rows.append(row)
-                    existing_ids.add(track["id"])
-
-        if new_rows:
-            df = pd.concat([df, pd.DataFrame(new_rows)], ignore_index=True)
+    # Tracks are stored once per id and playlist membership as column indices;
+    # the bool flag matrix and the DataFrame are built once at the end.
+    tracks: dict[int, dict] = {}
+    memberships: dict[int, list[int]] = {}
+    playlist_idx: dict[str, int] = {}
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        # Playlists are downloaded concurrently; map() keeps them in order so
+        # the playlist columns and progress reporting are unchanged.
+        fetched = pool.map(
+            lambda pid: fetch_with_retry(f"https://api.deezer.com/playlist/{pid}?limit=2000"),
+            playlists,
+        )
+        for idx, playlist in enumerate(
+            tqdm(fetched, total=len(playlists), desc="Fetching playlists")
+        ):
+            if progress_callback:
+                progress_callback("progress", idx + 1, len(playlists), playlist["title"])
+
+            col = playlist_idx.setdefault(playlist["title"], len(playlist_idx))
+            for track in playlist.get("tracks", {}).get("data", []):
+                if track["id"] not in tracks:
+                    tracks[track["id"]] = track
+                    memberships[track["id"]] = []
+                memberships[track["id"]].append(col)
+
+        # Enrichment costs several HTTP calls per track: it runs once per
+        # unique track, concurrently, after every playlist has been read.
+        new_rows = pool.map(lambda t: get_new_row(t, full_version), tracks.values())
+        rows: list[dict] = []
+        row_playlists: list[list[int]] = []
+        for idx, (row, cols) in enumerate(
+            zip(
+                tqdm(new_rows, total=len(tracks), desc="Fetching tracks"),
+                memberships.values(),
+            )
+        ):
+            if progress_callback:
+                progress_callback("tracks", idx + 1, len(tracks))
+            if row:
+                rows.append(row)
+                row_playlists.append(cols)
+
+    flags = np.zeros((len(rows), len(playlist_idx)), dtype=bool)
+    for i, cols in enumerate(row_playlists):
+        flags[i, cols] = True
+    # A playlist only gets a column if at least one of its tracks was kept
+    used = flags.any(axis=0)
+    flags = flags[:, used]
+    playlist_titles = [t for t, keep in zip(playlist_idx, used) if keep]
+
+    columns = COLUMNS_FULL if full_version else COLUMNS_SHORT
+    df = pd.DataFrame(rows)
+    df = df.reindex(columns=columns + [c for c in df.columns if c not in columns])
+    df = pd.concat([df, pd.DataFrame(flags, columns=playlist_titles)], axis=1)
 
     artist_cols = sorted(c for c in df.columns if c.startswith("artist_"))
     base = [c for c in df.columns if c not in artist_cols]
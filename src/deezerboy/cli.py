@@ -7,8 +7,8 @@ from pathlib import Path
 import click
 from dotenv import load_dotenv
 
-from .api import COLUMNS_FULL, fetch_tracks
-from .export import export_csv, export_excel, load_csv
+from .api import fetch_tracks
+from .export import export_csv, export_excel, get_playlist_cols, load_csv
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
@@ -75,9 +75,7 @@ def stats(path: str | None):
         click.secho("❌ Aucun CSV trouvé", fg="red")
         return
 
-    playlist_cols = [
-        c for c in df.columns if c not in COLUMNS_FULL and not c.startswith("artist_")
-    ]
+    playlist_cols = get_playlist_cols(df)
     click.echo("\n" + "=" * 50)
     click.secho("📊 STATISTIQUES DEEZER", fg="cyan", bold=True)
     click.echo("=" * 50)
@@ -15,6 +15,39 @@ PLAYLIST_ORDER = [
 ]
 
 
+CSV_DTYPES = {
+    "duration": "Int32",
+    "rank": "Int32",
+    "artist": "category",
+    "album": "category",
+    "artist_listeners": "Int64",
+    "artist_playcount": "Int64",
+    "track_listeners": "Int64",
+    "track_playcount": "Int64",
+    "title": "string",
+    "isrc": "string",
+    "release_date": "string",
+    "genre": "string",
+    "tags": "string",
+    "similar_artists": "string",
+}
+
+
+def get_playlist_cols(df: pd.DataFrame) -> list[str]:
+    from .api import COLUMNS_FULL
+    return [
+        c for c in df.columns
+        if c not in COLUMNS_FULL and not c.startswith("artist_")
+    ]
+
+
+def read_tracks_csv(source) -> pd.DataFrame:
+    df = pd.read_csv(source, dtype=CSV_DTYPES, engine="pyarrow")
+    playlist_cols = get_playlist_cols(df)
+    df[playlist_cols] = df[playlist_cols].fillna(False).astype(bool)
+    return df
+
+
 def reorder_columns(df: pd.DataFrame) -> pd.DataFrame:
     from .api import COLUMNS_FULL
     base = [c for c in COLUMNS_FULL if c in df.columns]
@@ -55,6 +88,6 @@ def load_csv(path: Path | None = None) -> pd.DataFrame | None:
     for p in candidates:
         if p and p.exists():
             logger.info(f"✅ CSV trouvé: {p}")
-            return pd.read_csv(p)
+            return read_tracks_csv(p)
     logger.warning("⚠️ Aucun CSV trouvé")
     return None
@@ -0,0 +1,40 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from deezerboy.export import read_tracks_csv
+
+FULL_CSV = """\
+id,title,artist,album,duration,rank,isrc,release_date,genre,tags,artist_listeners,artist_playcount,track_listeners,track_playcount,similar_artists,POJ,CTP
+1,a,A,X,200,10,I1,2001,rock,a; b,100,5000000000,10,20,Q,True,
+2,b,B,Y,210,,I2,2002-01-01,,,,,,,,,True
+3,c,C,Y,,12,I3,,pop,c,300,600,30,40,R,True,True
+"""
+
+
+class ReadTracksCsvTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "track_list.csv"
+        self.path.write_text(FULL_CSV, encoding="utf-8")
+
+    def test_blank_lastfm_stats(self):
+        df = read_tracks_csv(self.path)
+        self.assertEqual(len(df), 3)
+        self.assertTrue(df["artist_listeners"].isna()[1])
+        self.assertEqual(df["artist_playcount"][0], 5_000_000_000)
+
+    def test_blank_duration_and_rank(self):
+        df = read_tracks_csv(self.path)
+        self.assertTrue(df["rank"].isna()[1])
+        self.assertTrue(df["duration"].isna()[2])
+
+    def test_playlist_columns_are_bool(self):
+        df = read_tracks_csv(self.path)
+        self.assertEqual(df["POJ"].tolist(), [True, False, True])
+        self.assertEqual(df["CTP"].tolist(), [False, True, True])
+
+
+if __name__ == "__main__":
+    unittest.main()